@@ -3,24 +3,82 @@ AI API endpoints using Grok (xAI).
 Handles AI-powered task generation using Grok API.
 """
 
-from typing import Any, List
+import json
+import logging
+import uuid
+import httpx
+import orjson
+from typing import Any, AsyncIterator, Dict, List
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
-from openai import OpenAI
+from openai import AsyncOpenAI
+from json_repair import repair_json
 
 from app.dependencies import get_current_user
 from app.models.user import User
 from app.config import settings
 
-router = APIRouter()
+logger = logging.getLogger(__name__)
+
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Shared connection pool so concurrent Grok calls reuse warm keep-alive
+# connections instead of re-doing TCP/TLS handshakes
+http_client = httpx.AsyncClient(
+    limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+    timeout=60.0
+)
 
 # Configure Grok client
-client = OpenAI(
+client = AsyncOpenAI(
     api_key=settings.GROK_API_KEY,
-    base_url="https://api.x.ai/v1"
+    base_url="https://api.x.ai/v1",
+    http_client=http_client
 )
 
 
+# Structured output schemas, so Grok returns parseable JSON directly
+_TASK_ITEM_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "title": {"type": "string"},
+        "description": {"type": "string"},
+        "priority": {"type": "string", "enum": ["low", "medium", "high"]},
+        "priority_reasoning": {"type": "string"},
+        "effort_estimate": {"type": "integer"},
+        "effort_confidence": {"type": "string", "enum": ["low", "medium", "high"]},
+        "effort_reasoning": {"type": "string"}
+    },
+    "required": [
+        "title",
+        "description",
+        "priority",
+        "priority_reasoning",
+        "effort_estimate",
+        "effort_confidence",
+        "effort_reasoning"
+    ],
+    "additionalProperties": False
+}
+
+TASKS_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "tasks",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "tasks": {"type": "array", "items": _TASK_ITEM_SCHEMA}
+            },
+            "required": ["tasks"],
+            "additionalProperties": False
+        }
+    }
+}
+
+
 class TaskDecomposeRequest(BaseModel):
     """Request schema for AI task decomposition."""
     projectDescription: str = Field(..., min_length=10, max_length=2000)
@@ -45,6 +103,150 @@ class TaskDecomposeResponse(BaseModel):
     suggestions: List[AISuggestion]
 
 
+_TASK_GUIDELINES = """For each task, provide:
+1. A clear, actionable title (max 100 chars)
+2. A detailed description (2-3 sentences)
+3. Priority level (low/medium/high) with reasoning
+4. Effort estimate in hours (realistic estimate)
+5. Confidence level for the estimate (low/medium/high)
+6. Reasoning for the effort estimate"""
+
+_TASK_EXAMPLE = """{
+      "title": "Task title",
+      "description": "Detailed description",
+      "priority": "high",
+      "priority_reasoning": "Why this priority",
+      "effort_estimate": 8,
+      "effort_confidence": "medium",
+      "effort_reasoning": "Why this estimate"
+    }"""
+
+# The system prompt holds every fixed instruction, so each request starts with
+# the same prefix and the provider can serve it from its prompt cache. The
+# user message carries only that request's project description.
+SYSTEM_PROMPT = f"""You are a project management AI assistant that breaks down projects into actionable tasks. The user message is a project description. Break the project down into 5-8 actionable tasks.
+
+{_TASK_GUIDELINES}
+
+Format your response as a JSON object with this structure:
+{{
+  "tasks": [
+    {_TASK_EXAMPLE}
+  ]
+}}
+
+Be specific and practical. Focus on deliverable milestones. Return ONLY the JSON object, no additional text."""
+
+
+def _build_messages(project_description: str) -> List[Dict[str, str]]:
+    """Build the Grok chat messages for decomposing a project."""
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": project_description}
+    ]
+
+
+def _load_json(response_text: str) -> Any:
+    """Parse Grok's JSON output, repairing it only if strict parsing fails."""
+    try:
+        return orjson.loads(response_text)
+    except orjson.JSONDecodeError:
+        # Recovery path only; repair is far slower than a strict parse
+        return orjson.loads(repair_json(response_text))
+
+
+async def _decompose_one(project_description: str) -> List[Dict[str, Any]]:
+    """Ask Grok to decompose a single project; returns the raw task objects."""
+    completion = await client.chat.completions.create(
+        model="grok-2-1212",  # Latest Grok model
+        messages=_build_messages(project_description),
+        temperature=0.7,
+        max_tokens=2000,
+        response_format=TASKS_RESPONSE_FORMAT
+    )
+    
+    response_text = completion.choices[0].message.content
+    
+    # Parse JSON (shape is guaranteed by the response schema)
+    return _load_json(response_text)["tasks"]
+
+
+def _to_suggestion(base_id: str, idx: int, task: Dict[str, Any]) -> AISuggestion:
+    """
+    Convert one task object from the Grok response into an AISuggestion.
+    IDs only need to be unique, so every suggestion in a response shares
+    one random base_id and is told apart by its index.
+    """
+    return AISuggestion(
+        suggestion_id=f"grok-{base_id}-{idx}",
+        title=task.get("title", f"Task {idx + 1}"),
+        description=task.get("description", ""),
+        priority=task.get("priority", "medium").lower(),
+        priority_reasoning=task.get("priority_reasoning"),
+        effort_estimate=int(task.get("effort_estimate", 4)),
+        effort_confidence=task.get("effort_confidence"),
+        effort_reasoning=task.get("effort_reasoning"),
+        is_editable=True,
+        source="grok"
+    )
+
+
+class _JSONArrayStream:
+    """
+    Incremental parser for the elements of a JSON array arriving in chunks.
+    
+    Anything before the opening bracket (e.g. the '{"tasks": ' prefix of
+    the structured response) is skipped, and parsing stops at the closing
+    bracket.
+    """
+    
+    _decoder = json.JSONDecoder()
+    
+    def __init__(self):
+        self.done = False
+        self._buffer = ""
+        self._pos = -1  # Position inside buffer; -1 until the array has opened
+    
+    def feed(self, text: str) -> List[Any]:
+        """Add text and return the array elements completed by it."""
+        items = []
+        if self.done:
+            return items
+        
+        self._buffer += text
+        
+        if self._pos < 0:
+            start = self._buffer.find("[")
+            if start == -1:
+                return items
+            self._pos = start + 1
+        
+        buffer, pos = self._buffer, self._pos
+        while True:
+            # Skip separators between elements
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            
+            if pos >= len(buffer):
+                break
+            if buffer[pos] == "]":
+                self.done = True
+                break
+            
+            try:
+                item, pos = self._decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Element not complete yet, wait for more text
+                break
+            
+            items.append(item)
+        
+        # Drop text that has already been parsed
+        self._buffer = buffer[pos:]
+        self._pos = 0
+        return items
+
+
 @router.post("/task-decompose", response_model=TaskDecomposeResponse)
 async def decompose_project_to_tasks(
     request: TaskDecomposeRequest,
@@ -55,94 +257,15 @@ async def decompose_project_to_tasks(
     Powered by Grok AI (xAI).
     """
     try:
-        # Create detailed prompt for task generation
-        prompt = f"""You are a project management AI assistant. Break down the following project into 5-8 actionable tasks.
-
-Project Description:
-{request.projectDescription}
-
-For each task, provide:
-1. A clear, actionable title (max 100 chars)
-2. A detailed description (2-3 sentences)
-3. Priority level (low/medium/high) with reasoning
-4. Effort estimate in hours (realistic estimate)
-5. Confidence level for the estimate (low/medium/high)
-6. Reasoning for the effort estimate
-
-Format your response as a JSON array with this structure:
-[
-  {{
-    "title": "Task title",
-    "description": "Detailed description",
-    "priority": "high",
-    "priority_reasoning": "Why this priority",
-    "effort_estimate": 8,
-    "effort_confidence": "medium",
-    "effort_reasoning": "Why this estimate"
-  }}
-]
-
-Be specific and practical. Focus on deliverable milestones. Return ONLY the JSON array, no additional text."""
-        
-        # Call Grok API
-        completion = client.chat.completions.create(
-            model="grok-2-1212",  # Latest Grok model
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a helpful project management assistant that breaks down projects into actionable tasks. Always respond with valid JSON arrays."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            temperature=0.7,
-            max_tokens=2000
-        )
-        
-        response_text = completion.choices[0].message.content.strip()
-        
-        # Extract JSON from response (handle markdown code blocks)
-        if "```json" in response_text:
-            json_start = response_text.find("```json") + 7
-            json_end = response_text.find("```", json_start)
-            response_text = response_text[json_start:json_end].strip()
-        elif "```" in response_text:
-            json_start = response_text.find("```") + 3
-            json_end = response_text.find("```", json_start)
-            response_text = response_text[json_start:json_end].strip()
-        
-        # Parse JSON
-        import json
-        import uuid
-        
-        try:
-            tasks_data = json.loads(response_text)
-        except json.JSONDecodeError:
-            # Fallback: try to find JSON array in the text
-            import re
-            json_match = re.search(r'\[.*\]', response_text, re.DOTALL)
-            if json_match:
-                tasks_data = json.loads(json_match.group())
-            else:
-                raise ValueError("Could not parse AI response as JSON")
+        # Call Grok API; each request gets its own completion so one user's
+        # description never shares a prompt with another's
+        tasks_data = await _decompose_one(request.projectDescription)
         
         # Convert to AISuggestion objects
+        base_id = uuid.uuid4().hex
         suggestions = []
         for idx, task in enumerate(tasks_data):
-            suggestion = AISuggestion(
-                suggestion_id=f"grok-{uuid.uuid4()}",
-                title=task.get("title", f"Task {idx + 1}"),
-                description=task.get("description", ""),
-                priority=task.get("priority", "medium").lower(),
-                priority_reasoning=task.get("priority_reasoning"),
-                effort_estimate=int(task.get("effort_estimate", 4)),
-                effort_confidence=task.get("effort_confidence"),
-                effort_reasoning=task.get("effort_reasoning"),
-                is_editable=True,
-                source="grok"
-            )
+            suggestion = _to_suggestion(base_id, idx, task)
             suggestions.append(suggestion)
         
         return TaskDecomposeResponse(suggestions=suggestions)
@@ -155,3 +278,54 @@ Be specific and practical. Focus on deliverable milestones. Return ONLY the JSON
             detail=f"Failed to generate AI suggestions: {str(e)}"
         )
 
+
+@router.post("/task-decompose/stream")
+async def stream_project_tasks(
+    request: TaskDecomposeRequest,
+    current_user: User = Depends(get_current_user)
+) -> StreamingResponse:
+    """
+    Streaming variant of task decomposition.
+    Returns newline-delimited JSON, one AISuggestion per line, emitted as
+    soon as Grok finishes generating each task.
+    """
+    try:
+        stream = await client.chat.completions.create(
+            model="grok-2-1212",
+            messages=_build_messages(request.projectDescription),
+            temperature=0.7,
+            max_tokens=2000,
+            response_format=TASKS_RESPONSE_FORMAT,
+            stream=True
+        )
+    except Exception as e:
+        logger.exception("Grok AI streaming request failed")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to generate AI suggestions: {str(e)}"
+        )
+    
+    async def ndjson_lines() -> AsyncIterator[str]:
+        parser = _JSONArrayStream()
+        base_id = uuid.uuid4().hex
+        idx = 0
+        try:
+            async for chunk in stream:
+                if not chunk.choices or not chunk.choices[0].delta.content:
+                    continue
+                
+                for task in parser.feed(chunk.choices[0].delta.content):
+                    yield _to_suggestion(base_id, idx, task).model_dump_json() + "\n"
+                    idx += 1
+                
+                if parser.done:
+                    break
+        except Exception:
+            # Headers are already sent, so the error can only be logged
+            logger.exception("Grok AI stream failed mid-response")
+        finally:
+            # Release the pooled connection (and stop upstream generation)
+            # when leaving early, on error, or on client disconnect
+            await stream.close()
+    
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
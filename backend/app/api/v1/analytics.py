@@ -7,50 +7,58 @@ from typing import Any, List
 from datetime import datetime, timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
+from sqlalchemy import select, union, func, and_, or_, case, extract, cast, Date, DateTime
 
 from app.dependencies import get_db, get_current_user
+from app.core.cache import cached_analytics, project_ids_cache
 from app.models.user import User
 from app.models.project import Project
-from app.models.task import Task
+from app.models.task import Task, TaskPriority, TaskStatus
 from app.models.project_member import ProjectMember
 from app.schemas.analytics import (
     KPIResponse,
     TaskTrendResponse,
     PriorityDistributionResponse,
-    StatusDistributionResponse
+    StatusDistributionResponse,
+    AnalyticsOverviewResponse
 )
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
 def get_user_projects(db: Session, user_id: int) -> List[int]:
     """Get all project IDs the user has access to."""
     # Projects owned by user
-    owned_projects = db.query(Project.id).filter(Project.owner_id == user_id).all()
+    owned_projects = select(Project.id).where(Project.user_id == user_id)
     
     # Projects where user is a member
-    member_projects = db.query(ProjectMember.project_id).filter(
+    member_projects = select(ProjectMember.project_id).where(
         ProjectMember.user_id == user_id
-    ).all()
+    )
     
-    project_ids = [p[0] for p in owned_projects] + [p[0] for p in member_projects]
-    return list(set(project_ids))
+    # UNION lets the database drop duplicates in a single round-trip
+    return list(db.execute(union(owned_projects, member_projects)).scalars())
 
 
-@router.get("/kpis", response_model=KPIResponse)
-def get_kpis(
+def get_user_project_ids(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
-) -> Any:
+) -> List[int]:
     """
-    Get key performance indicators for the current user.
-    Includes total projects, tasks, and completion metrics.
+    Dependency providing the project IDs the current user has access to.
+    Resolved once per request and memoized per user for a few seconds.
     """
-    # Get user's projects
-    project_ids = get_user_projects(db, current_user.id)
-    
+    project_ids = project_ids_cache.get(current_user.id)
+    if project_ids is None:
+        project_ids = get_user_projects(db, current_user.id)
+        project_ids_cache.set(current_user.id, project_ids)
+    return project_ids
+
+
+def _kpis(db: Session, project_ids: List[int]) -> KPIResponse:
+    """Compute the KPI summary for the given projects."""
     if not project_ids:
         return KPIResponse(
             total_projects=0,
@@ -64,67 +72,44 @@ def get_kpis(
     # Total projects
     total_projects = len(project_ids)
     
-    # Task statistics
-    total_tasks = db.query(func.count(Task.id)).filter(
+    # Task statistics and average completion time (in days) in one pass.
+    # Tasks have no completion timestamp; a done task's last update is when
+    # it was moved to done (unless it was edited afterwards).
+    is_completed = Task.status == TaskStatus.DONE
+    total_tasks, completed_tasks, in_progress_tasks, avg_completion_seconds = db.execute(select(
+        func.count(Task.id),
+        func.sum(case((is_completed, 1), else_=0)),
+        func.sum(case((Task.status == TaskStatus.IN_PROGRESS, 1), else_=0)),
+        func.avg(case(
+            (is_completed, extract("epoch", Task.updated_at - Task.created_at))
+        ))
+    ).where(
         Task.project_id.in_(project_ids)
-    ).scalar()
+    )).one()
     
-    completed_tasks = db.query(func.count(Task.id)).filter(
-        and_(
-            Task.project_id.in_(project_ids),
-            Task.status == "completed"
-        )
-    ).scalar()
-    
-    in_progress_tasks = db.query(func.count(Task.id)).filter(
-        and_(
-            Task.project_id.in_(project_ids),
-            Task.status == "in_progress"
-        )
-    ).scalar()
+    total_tasks = total_tasks or 0
+    completed_tasks = int(completed_tasks or 0)
+    in_progress_tasks = int(in_progress_tasks or 0)
     
     # Completion rate
     completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0.0
     
-    # Average completion time (in days)
-    completed_tasks_with_dates = db.query(Task).filter(
-        and_(
-            Task.project_id.in_(project_ids),
-            Task.status == "completed",
-            Task.completed_at.isnot(None)
-        )
-    ).all()
-    
     avg_completion_time = None
-    if completed_tasks_with_dates:
-        total_days = sum([
-            (task.completed_at - task.created_at).days 
-            for task in completed_tasks_with_dates
-        ])
-        avg_completion_time = round(total_days / len(completed_tasks_with_dates), 1)
+    if avg_completion_seconds is not None:
+        avg_completion_time = round(float(avg_completion_seconds) / 86400, 1)
     
     return KPIResponse(
         total_projects=total_projects,
-        total_tasks=total_tasks or 0,
-        completed_tasks=completed_tasks or 0,
-        in_progress_tasks=in_progress_tasks or 0,
+        total_tasks=total_tasks,
+        completed_tasks=completed_tasks,
+        in_progress_tasks=in_progress_tasks,
         completion_rate=round(completion_rate, 1),
         avg_completion_time=avg_completion_time
     )
 
 
-@router.get("/task-trends", response_model=List[TaskTrendResponse])
-def get_task_trends(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-) -> Any:
-    """
-    Get task creation and completion trends over the last 30 days.
-    Returns daily counts of created and completed tasks.
-    """
-    # Get user's projects
-    project_ids = get_user_projects(db, current_user.id)
-    
+def _task_trends(db: Session, project_ids: List[int]) -> List[TaskTrendResponse]:
+    """Compute daily created/completed task counts for the last 30 days."""
     if not project_ids:
         return []
     
@@ -132,65 +117,67 @@ def get_task_trends(
     end_date = datetime.utcnow().date()
     start_date = end_date - timedelta(days=29)
     
-    # Initialize response with all dates
-    trends = []
-    current_date = start_date
+    # Calendar of every day in the window, generated server-side
+    days = select(
+        cast(
+            func.generate_series(cast(start_date, DateTime), cast(end_date, DateTime), timedelta(days=1)),
+            Date
+        ).label("day")
+    ).subquery("days")
     
-    while current_date <= end_date:
-        # Count tasks created on this date
-        created_count = db.query(func.count(Task.id)).filter(
-            and_(
-                Task.project_id.in_(project_ids),
-                func.date(Task.created_at) == current_date
-            )
-        ).scalar()
-        
-        # Count tasks completed on this date
-        completed_count = db.query(func.count(Task.id)).filter(
-            and_(
-                Task.project_id.in_(project_ids),
-                Task.status == "completed",
-                func.date(Task.completed_at) == current_date
-            )
-        ).scalar()
-        
-        trends.append(TaskTrendResponse(
-            date=current_date,
-            created=created_count or 0,
-            completed=completed_count or 0
-        ))
-        
-        current_date += timedelta(days=1)
+    # Daily counts for the whole window in one grouped subquery each
+    created_day = func.date(Task.created_at)
+    created = select(
+        created_day.label("day"),
+        func.count(Task.id).label("count")
+    ).where(
+        and_(
+            Task.project_id.in_(project_ids),
+            Task.created_at >= start_date
+        )
+    ).group_by(created_day).subquery("created")
     
-    return trends
-
-
-@router.get("/priority-distribution", response_model=List[PriorityDistributionResponse])
-def get_priority_distribution(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-) -> Any:
-    """
-    Get distribution of tasks by priority level.
-    Returns counts for low, medium, and high priority tasks.
-    """
-    # Get user's projects
-    project_ids = get_user_projects(db, current_user.id)
+    # Completion day approximated by the done task's last update (see _kpis)
+    completed_day = func.date(Task.updated_at)
+    completed = select(
+        completed_day.label("day"),
+        func.count(Task.id).label("count")
+    ).where(
+        and_(
+            Task.project_id.in_(project_ids),
+            Task.status == TaskStatus.DONE,
+            Task.updated_at >= start_date
+        )
+    ).group_by(completed_day).subquery("completed")
     
-    if not project_ids:
-        return [
-            PriorityDistributionResponse(priority="low", count=0),
-            PriorityDistributionResponse(priority="medium", count=0),
-            PriorityDistributionResponse(priority="high", count=0)
-        ]
+    # LEFT JOIN onto the calendar fills days without activity with zeros
+    rows = db.execute(select(
+        days.c.day,
+        func.coalesce(created.c.count, 0),
+        func.coalesce(completed.c.count, 0)
+    ).select_from(days).outerjoin(
+        created, created.c.day == days.c.day
+    ).outerjoin(
+        completed, completed.c.day == days.c.day
+    ).order_by(days.c.day)).all()
     
-    # Get counts by priority
-    priority_counts = db.query(
+    return [
+        TaskTrendResponse(date=day, created=created_count, completed=completed_count)
+        for day, created_count, completed_count in rows
+    ]
+
+
+def _priority_distribution(db: Session, user_id: int) -> List[PriorityDistributionResponse]:
+    """Count the user's tasks per priority level."""
+    # Get counts by priority across the user's projects (owners are members too)
+    priority_counts = db.execute(select(
         Task.priority,
         func.count(Task.id).label('count')
-    ).filter(
-        Task.project_id.in_(project_ids)
-    ).group_by(Task.priority).all()
+    ).join(
+        ProjectMember, ProjectMember.project_id == Task.project_id
+    ).where(
+        ProjectMember.user_id == user_id
+    ).group_by(Task.priority)).all()
     
     # Convert to dict for easy lookup
     counts_dict = {p: c for p, c in priority_counts}
@@ -198,46 +185,24 @@ def get_priority_distribution(
     # Return all priorities with counts
     return [
         PriorityDistributionResponse(
-            priority="low",
-            count=counts_dict.get("low", 0)
-        ),
-        PriorityDistributionResponse(
-            priority="medium",
-            count=counts_dict.get("medium", 0)
-        ),
-        PriorityDistributionResponse(
-            priority="high",
-            count=counts_dict.get("high", 0)
+            priority=priority.value,
+            count=counts_dict.get(priority, 0)
         )
+        for priority in TaskPriority
     ]
 
 
-@router.get("/status-distribution", response_model=List[StatusDistributionResponse])
-def get_status_distribution(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-) -> Any:
-    """
-    Get distribution of tasks by status.
-    Returns counts for todo, in_progress, and completed tasks.
-    """
-    # Get user's projects
-    project_ids = get_user_projects(db, current_user.id)
-    
-    if not project_ids:
-        return [
-            StatusDistributionResponse(status="todo", count=0),
-            StatusDistributionResponse(status="in_progress", count=0),
-            StatusDistributionResponse(status="completed", count=0)
-        ]
-    
-    # Get counts by status
-    status_counts = db.query(
+def _status_distribution(db: Session, user_id: int) -> List[StatusDistributionResponse]:
+    """Count the user's tasks per status."""
+    # Get counts by status across the user's projects (owners are members too)
+    status_counts = db.execute(select(
         Task.status,
         func.count(Task.id).label('count')
-    ).filter(
-        Task.project_id.in_(project_ids)
-    ).group_by(Task.status).all()
+    ).join(
+        ProjectMember, ProjectMember.project_id == Task.project_id
+    ).where(
+        ProjectMember.user_id == user_id
+    ).group_by(Task.status)).all()
     
     # Convert to dict for easy lookup
     counts_dict = {s: c for s, c in status_counts}
@@ -245,16 +210,82 @@ def get_status_distribution(
     # Return all statuses with counts
     return [
         StatusDistributionResponse(
-            status="todo",
-            count=counts_dict.get("todo", 0)
-        ),
-        StatusDistributionResponse(
-            status="in_progress",
-            count=counts_dict.get("in_progress", 0)
-        ),
-        StatusDistributionResponse(
-            status="completed",
-            count=counts_dict.get("completed", 0)
+            status=task_status.value,
+            count=counts_dict.get(task_status, 0)
         )
+        for task_status in TaskStatus
     ]
 
+
+@router.get("/kpis", response_model=KPIResponse)
+@cached_analytics
+def get_kpis(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    project_ids: List[int] = Depends(get_user_project_ids)
+) -> Any:
+    """
+    Get key performance indicators for the current user.
+    Includes total projects, tasks, and completion metrics.
+    """
+    return _kpis(db, project_ids)
+
+
+@router.get("/task-trends", response_model=List[TaskTrendResponse])
+@cached_analytics
+def get_task_trends(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    project_ids: List[int] = Depends(get_user_project_ids)
+) -> Any:
+    """
+    Get task creation and completion trends over the last 30 days.
+    Returns daily counts of created and completed tasks.
+    """
+    return _task_trends(db, project_ids)
+
+
+@router.get("/priority-distribution", response_model=List[PriorityDistributionResponse])
+@cached_analytics
+def get_priority_distribution(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+) -> Any:
+    """
+    Get distribution of tasks by priority level.
+    Returns counts for low, medium, and high priority tasks.
+    """
+    return _priority_distribution(db, current_user.id)
+
+
+@router.get("/status-distribution", response_model=List[StatusDistributionResponse])
+@cached_analytics
+def get_status_distribution(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+) -> Any:
+    """
+    Get distribution of tasks by status.
+    Returns counts for todo, in_progress, and done tasks.
+    """
+    return _status_distribution(db, current_user.id)
+
+
+@router.get("/overview", response_model=AnalyticsOverviewResponse)
+@cached_analytics
+def get_overview(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    project_ids: List[int] = Depends(get_user_project_ids)
+) -> Any:
+    """
+    Get all dashboard analytics in a single request.
+    Combines KPIs, task trends, and priority/status distributions so the
+    dashboard needs one round-trip and one project lookup instead of four.
+    """
+    return AnalyticsOverviewResponse(
+        kpis=_kpis(db, project_ids),
+        task_trends=_task_trends(db, project_ids),
+        priority_distribution=_priority_distribution(db, current_user.id),
+        status_distribution=_status_distribution(db, current_user.id)
+    )
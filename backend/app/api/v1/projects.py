@@ -3,12 +3,19 @@ Projects API endpoints.
 Handles project CRUD operations.
 """
 
-from typing import List, Any
+from typing import List, Any, Optional, Tuple
+from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.dependencies import get_current_user
+from app.core.orm import strict_loading
+from app.core.cache import (
+    invalidate_membership,
+    invalidate_user_analytics,
+    invalidate_user_projects
+)
 from app.models.user import User
 from app.models.project import Project
 from app.models.project_member import ProjectMember
@@ -17,6 +24,23 @@ from app.schemas.project import ProjectCreate, ProjectUpdate, ProjectResponse
 router = APIRouter()
 
 
+def load_project_with_role(
+    db: Session,
+    project_id: str,
+    user_id: UUID
+) -> Optional[Tuple[Project, str]]:
+    """
+    Load a project together with the user's role in it.
+    Returns None if the project doesn't exist or the user is not a member.
+    """
+    return db.query(Project, ProjectMember.role).join(
+        ProjectMember, ProjectMember.project_id == Project.id
+    ).filter(
+        Project.id == project_id,
+        ProjectMember.user_id == user_id
+    ).first()
+
+
 @router.get("", response_model=List[ProjectResponse])
 def list_projects(
     db: Session = Depends(get_db),
@@ -27,16 +51,11 @@ def list_projects(
     Returns projects where user is a member.
     """
     # Get all projects where user is a member
-    project_members = db.query(ProjectMember).filter(
+    projects = db.query(Project).options(*strict_loading()).join(
+        ProjectMember, ProjectMember.project_id == Project.id
+    ).filter(
         ProjectMember.user_id == current_user.id
     ).all()
-    
-    project_ids = [pm.project_id for pm in project_members]
-    
-    if not project_ids:
-        return []
-    
-    projects = db.query(Project).filter(Project.id.in_(project_ids)).all()
     return projects
 
 
@@ -50,9 +69,11 @@ def create_project(
     Create a new project.
     The creator is automatically added as Owner.
     """
+    user_id = current_user.id
+    
     # Create project
     new_project = Project(
-        user_id=current_user.id,  # creator
+        user_id=user_id,  # creator
         title=project_data.title,
         description=project_data.description
     )
@@ -63,11 +84,12 @@ def create_project(
     # Add creator as Owner
     project_member = ProjectMember(
         project_id=new_project.id,
-        user_id=current_user.id,
+        user_id=user_id,
         role="Owner"
     )
     db.add(project_member)
     db.commit()
+    invalidate_user_projects(user_id)
     
     return new_project
 
@@ -82,25 +104,15 @@ def get_project(
     Get a specific project by ID.
     User must be a member of the project.
     """
-    # Check if user is a member
-    member = db.query(ProjectMember).filter(
-        ProjectMember.project_id == project_id,
-        ProjectMember.user_id == current_user.id
-    ).first()
+    row = load_project_with_role(db, project_id, current_user.id)
     
-    if not member:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to access this project"
         )
     
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if not project:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found"
-        )
-    
+    project, _ = row
     return project
 
 
@@ -116,23 +128,15 @@ def update_project(
     User must be Owner or Editor.
     """
     # Check if user is a member with appropriate role
-    member = db.query(ProjectMember).filter(
-        ProjectMember.project_id == project_id,
-        ProjectMember.user_id == current_user.id
-    ).first()
+    row = load_project_with_role(db, project_id, current_user.id)
     
-    if not member or member.role == "Viewer":
+    if not row or row[1] == "Viewer":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to update this project"
         )
     
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if not project:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found"
-        )
+    project, _ = row
     
     # Update fields
     if project_data.title is not None:
@@ -156,28 +160,31 @@ def delete_project(
     Only project Owner can delete.
     """
     # Check if user is Owner
-    member = db.query(ProjectMember).filter(
-        ProjectMember.project_id == project_id,
-        ProjectMember.user_id == current_user.id,
-        ProjectMember.role == "Owner"
-    ).first()
+    row = load_project_with_role(db, project_id, current_user.id)
     
-    if not member:
+    if not row or row[1] != "Owner":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only project owner can delete the project"
         )
     
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if not project:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found"
-        )
+    project, _ = row
+    
+    # Members whose cached roles, project lists and analytics must be
+    # dropped once the project is gone (the owner is one of them)
+    member_ids = [
+        user_id for (user_id,) in db.query(ProjectMember.user_id).filter(
+            ProjectMember.project_id == project.id
+        ).all()
+    ]
     
     # Delete project (cascade will handle related records)
     db.delete(project)
     db.commit()
+    for user_id in member_ids:
+        invalidate_membership(user_id, project_id)
+        invalidate_user_projects(user_id)
+        invalidate_user_analytics(user_id)
     
     return None
 
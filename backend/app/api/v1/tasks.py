@@ -3,43 +3,91 @@ Tasks API endpoints.
 Handles task CRUD operations and bulk creation.
 """
 
-from typing import List, Any
+from typing import List, Any, Optional, Tuple
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
+from sqlalchemy import and_, insert
 
 from app.database import get_db
 from app.dependencies import get_current_user
+from app.core.orm import strict_loading
+from app.core.cache import cache_role, get_cached_role, invalidate_user_analytics
 from app.models.user import User
 from app.models.task import Task
-from app.models.project_member import ProjectMember
+from app.models.project_member import ProjectMember, ProjectRole
 from app.schemas.task import TaskCreate, TaskUpdate, TaskResponse, TaskBulkCreate
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
-def check_project_access(project_id: str, user_id: str, db: Session, min_role: str = "Viewer") -> None:
+def _require_role(role: Optional[str], min_role: str) -> str:
     """
-    Check if user has access to project with minimum role.
+    Check that a membership role meets the minimum role.
     Raises HTTPException if not authorized.
     """
-    member = db.query(ProjectMember).filter(
-        ProjectMember.project_id == project_id,
-        ProjectMember.user_id == user_id
-    ).first()
-    
-    if not member:
+    if not role:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to access this project"
         )
     
     # Check role permissions (Owner > Editor > Viewer)
-    roles_hierarchy = {"Owner": 3, "Editor": 2, "Viewer": 1}
-    if roles_hierarchy.get(member.role, 0) < roles_hierarchy.get(min_role, 0):
+    if ProjectRole(role).rank < ProjectRole(min_role).rank:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=f"Insufficient permissions. Requires {min_role} role or higher"
         )
+    
+    return role
+
+
+def check_project_access(project_id: str, user_id: str, db: Session, min_role: str = "Viewer") -> str:
+    """
+    Check if user has access to project with minimum role.
+    Raises HTTPException if not authorized.
+    
+    Returns:
+        str: User's role in the project
+    """
+    role = get_cached_role(user_id, project_id)
+    if role is None:
+        role = db.query(ProjectMember.role).filter(
+            ProjectMember.project_id == project_id,
+            ProjectMember.user_id == user_id
+        ).scalar()
+        if role is not None:
+            cache_role(user_id, project_id, role)
+    
+    return _require_role(role, min_role)
+
+
+def load_task_with_role(db: Session, task_id: str, user_id: str) -> Optional[Tuple[Task, Optional[str]]]:
+    """
+    Load a task together with the user's role in its project.
+    Returns None if the task doesn't exist; the role is None for non-members.
+    """
+    return db.query(Task, ProjectMember.role).outerjoin(
+        ProjectMember,
+        and_(
+            ProjectMember.project_id == Task.project_id,
+            ProjectMember.user_id == user_id
+        )
+    ).filter(Task.id == task_id).first()
+
+
+def _task_values(project_id: str, task_data: TaskCreate) -> dict:
+    """Build Task column values from a TaskCreate payload."""
+    return dict(
+        project_id=project_id,
+        title=task_data.title,
+        description=task_data.description,
+        priority=task_data.priority,
+        status=task_data.status if task_data.status else "todo",
+        effort_estimate=task_data.effort_estimate,
+        ai_generated=task_data.ai_generated if task_data.ai_generated is not None else False,
+        created_by=task_data.created_by if task_data.created_by else "user"
+    )
 
 
 @router.get("/projects/{project_id}/tasks", response_model=List[TaskResponse])
@@ -54,7 +102,7 @@ def list_project_tasks(
     """
     check_project_access(project_id, current_user.id, db, "Viewer")
     
-    tasks = db.query(Task).filter(Task.project_id == project_id).all()
+    tasks = db.query(Task).options(*strict_loading()).filter(Task.project_id == project_id).all()
     return tasks
 
 
@@ -69,23 +117,14 @@ def create_task(
     Create a new task in a project.
     User must be Editor or Owner.
     """
-    check_project_access(project_id, current_user.id, db, "Editor")
+    user_id = current_user.id
+    check_project_access(project_id, user_id, db, "Editor")
     
-    new_task = Task(
-        project_id=project_id,
-        title=task_data.title,
-        description=task_data.description,
-        priority=task_data.priority,
-        status=task_data.status if task_data.status else "todo",
-        effort_estimate=task_data.effort_estimate,
-        ai_generated=task_data.ai_generated if task_data.ai_generated is not None else False,
-        ai_priority_suggestion=task_data.ai_priority_suggestion,
-        ai_effort_suggestion=task_data.ai_effort_suggestion,
-        created_by=task_data.created_by if task_data.created_by else "user"
-    )
+    new_task = Task(**_task_values(project_id, task_data))
     db.add(new_task)
     db.commit()
     db.refresh(new_task)
+    invalidate_user_analytics(user_id)
     
     return new_task
 
@@ -101,32 +140,27 @@ def create_tasks_bulk(
     Create multiple tasks at once (for AI-generated tasks).
     User must be Editor or Owner.
     """
-    check_project_access(project_id, current_user.id, db, "Editor")
-    
-    created_tasks = []
-    for task_data in bulk_data.tasks:
-        new_task = Task(
-            project_id=project_id,
-            title=task_data.title,
-            description=task_data.description,
-            priority=task_data.priority,
-            status=task_data.status if task_data.status else "todo",
-            effort_estimate=task_data.effort_estimate,
-            ai_generated=task_data.ai_generated if task_data.ai_generated is not None else False,
-            ai_priority_suggestion=task_data.ai_priority_suggestion,
-            ai_effort_suggestion=task_data.ai_effort_suggestion,
-            created_by=task_data.created_by if task_data.created_by else "user"
-        )
-        db.add(new_task)
-        created_tasks.append(new_task)
+    user_id = current_user.id
+    check_project_access(project_id, user_id, db, "Editor")
     
-    db.commit()
+    if not bulk_data.tasks:
+        return []
+    
+    # One multi-row INSERT ... RETURNING instead of an INSERT and a
+    # refresh SELECT per task; rows come back in request order
+    rows = [_task_values(project_id, task_data) for task_data in bulk_data.tasks]
+    created_tasks = db.scalars(
+        insert(Task).returning(Task, sort_by_parameter_order=True),
+        rows
+    ).all()
     
-    # Refresh all tasks
-    for task in created_tasks:
-        db.refresh(task)
+    # Serialize before commit so expired attributes aren't reloaded per task
+    response = [TaskResponse.model_validate(task) for task in created_tasks]
+    
+    db.commit()
+    invalidate_user_analytics(user_id)
     
-    return created_tasks
+    return response
 
 
 @router.put("/tasks/{task_id}", response_model=TaskResponse)
@@ -140,14 +174,16 @@ def update_task(
     Update a task.
     User must be Editor or Owner of the project.
     """
-    task = db.query(Task).filter(Task.id == task_id).first()
-    if not task:
+    user_id = current_user.id
+    row = load_task_with_role(db, task_id, user_id)
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Task not found"
         )
     
-    check_project_access(task.project_id, current_user.id, db, "Editor")
+    task, role = row
+    _require_role(role, "Editor")
     
     # Update fields
     if task_data.title is not None:
@@ -163,6 +199,7 @@ def update_task(
     
     db.commit()
     db.refresh(task)
+    invalidate_user_analytics(user_id)
     return task
 
 
@@ -176,17 +213,20 @@ def delete_task(
     Delete a task.
     User must be Editor or Owner of the project.
     """
-    task = db.query(Task).filter(Task.id == task_id).first()
-    if not task:
+    user_id = current_user.id
+    row = load_task_with_role(db, task_id, user_id)
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Task not found"
         )
     
-    check_project_access(task.project_id, current_user.id, db, "Editor")
+    task, role = row
+    _require_role(role, "Editor")
     
     db.delete(task)
     db.commit()
+    invalidate_user_analytics(user_id)
     
     return None
 
@@ -3,15 +3,20 @@ Team API endpoints.
 Handles project members and invitations.
 """
 
-from typing import Any, List
-from datetime import datetime, timedelta
-import secrets
+from typing import Any, List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import and_, func, literal, select, text, update
+from sqlalchemy.dialects.postgresql import insert
 
 from app.dependencies import get_db, get_current_user
+from app.core.orm import strict_loading
+from app.core.security import hash_invitation_token
+from app.core.cache import invalidate_membership, invalidate_user_projects
+from app.utils.ids import uuid7
+from app.utils.tokens import generate_invitation_token
 from app.models.user import User
 from app.models.project import Project
 from app.models.project_member import ProjectMember
@@ -24,7 +29,7 @@ from app.schemas.team import (
     InvitationAccept
 )
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
 def check_project_access(
@@ -34,26 +39,28 @@ def check_project_access(
     required_role: str = "member"
 ) -> Project:
     """Check if user has access to project with required role."""
-    # Get project
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if not project:
+    # Get project together with the user's membership (if any)
+    row = db.query(Project, ProjectMember).outerjoin(
+        ProjectMember,
+        and_(
+            ProjectMember.project_id == Project.id,
+            ProjectMember.user_id == current_user.id
+        )
+    ).filter(Project.id == project_id).first()
+    
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found"
         )
     
+    project, membership = row
+    
     # Check if user is project owner
     if project.owner_id == current_user.id:
         return project
     
     # Check if user is a member with required role
-    membership = db.query(ProjectMember).filter(
-        and_(
-            ProjectMember.project_id == project_id,
-            ProjectMember.user_id == current_user.id
-        )
-    ).first()
-    
     if not membership:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -70,37 +77,88 @@ def check_project_access(
     return project
 
 
+def load_invitation_for_user(
+    db: Session,
+    invitation_id: int,
+    user_id: int
+) -> Optional[Tuple[ProjectInvitation, Optional[int]]]:
+    """
+    Load an invitation together with the user's membership id, if the user
+    already belongs to the invited project.
+    Returns None if the invitation doesn't exist.
+    """
+    return db.query(ProjectInvitation, ProjectMember.id).outerjoin(
+        ProjectMember,
+        and_(
+            ProjectMember.project_id == ProjectInvitation.project_id,
+            ProjectMember.user_id == user_id
+        )
+    ).filter(
+        ProjectInvitation.id == invitation_id
+    ).first()
+
+
 @router.get("/projects/{project_id}/members", response_model=List[TeamMemberResponse])
 def get_project_members(
     project_id: int,
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ) -> Any:
-    """Get all members of a project."""
+    """
+    Get project members, owner first.
+    Returns one page of at most `limit` entries (50 by default) starting at
+    `offset`. The owner counts as the first entry, and an `X-Next-Offset`
+    header is set when more members follow.
+    """
     project = check_project_access(project_id, db, current_user)
     
-    # Get all members with their profiles
+    # The owner occupies position 0, so member rows start one position later
+    include_owner = offset == 0
+    member_offset = max(offset - 1, 0)
+    
+    query = db.query(ProjectMember).options(*strict_loading()).filter(
+        ProjectMember.project_id == project_id
+    ).order_by(
+        ProjectMember.joined_at, ProjectMember.id
+    ).offset(member_offset)
+    
+    member_limit = limit - 1 if include_owner else limit
+    # Fetch one extra row to detect a next page without a COUNT query
+    project_members = query.limit(member_limit + 1).all()
+    has_more = len(project_members) > member_limit
+    project_members = project_members[:member_limit]
+    
+    # Load owner and member profiles in a single IN query
+    user_ids = [pm.user_id for pm in project_members]
+    if include_owner:
+        user_ids.append(project.owner_id)
+    profiles = {
+        p.id: p for p in db.query(Profile).filter(Profile.id.in_(user_ids)).all()
+    }
+    
+    # Rows come from the database, so skip per-field validation
+    # (the response model still validates the list on the way out)
     members = []
     
     # Add project owner
-    owner_profile = db.query(Profile).filter(Profile.id == project.owner_id).first()
-    members.append(TeamMemberResponse(
-        id=project.owner_id,
-        email=owner_profile.email if owner_profile else "unknown@email.com",
-        full_name=owner_profile.full_name if owner_profile else "Project Owner",
-        avatar_url=owner_profile.avatar_url if owner_profile else None,
-        role="owner",
-        joined_at=project.created_at
-    ))
+    if include_owner:
+        owner_profile = profiles.get(project.owner_id)
+        members.append(TeamMemberResponse.model_construct(
+            id=project.owner_id,
+            email=owner_profile.email if owner_profile else "unknown@email.com",
+            full_name=owner_profile.full_name if owner_profile else "Project Owner",
+            avatar_url=owner_profile.avatar_url if owner_profile else None,
+            role="owner",
+            joined_at=project.created_at
+        ))
     
     # Add other members
-    project_members = db.query(ProjectMember).filter(
-        ProjectMember.project_id == project_id
-    ).all()
-    
     for pm in project_members:
-        profile = db.query(Profile).filter(Profile.id == pm.user_id).first()
-        members.append(TeamMemberResponse(
+        profile = profiles.get(pm.user_id)
+        members.append(TeamMemberResponse.model_construct(
             id=pm.user_id,
             email=profile.email if profile else "unknown@email.com",
             full_name=profile.full_name if profile else "Team Member",
@@ -109,6 +167,9 @@ def get_project_members(
             joined_at=pm.joined_at
         ))
     
+    if has_more:
+        response.headers["X-Next-Offset"] = str(offset + len(members))
+    
     return members
 
 
@@ -120,8 +181,12 @@ def invite_member(
     current_user: User = Depends(get_current_user)
 ) -> Any:
     """Send invitation to join a project."""
+    # Generate token up front so no non-DB work happens inside the transaction
+    invitation_token = generate_invitation_token()
+    
     # Check if current user has admin access
     project = check_project_access(project_id, db, current_user, required_role="admin")
+    project_name = project.name
     
     # Check if user exists
     invitee_profile = db.query(Profile).filter(Profile.email == invitation.email).first()
@@ -141,52 +206,58 @@ def invite_member(
                 detail="User is already a member of this project"
             )
     
-    # Check for existing pending invitation
-    existing_invitation = db.query(ProjectInvitation).filter(
-        and_(
-            ProjectInvitation.project_id == project_id,
-            ProjectInvitation.email == invitation.email,
-            ProjectInvitation.status == "pending"
-        )
+    # Create invitation, unless a pending one already exists for this email.
+    # An expired one still holds the pending slot, so it is reissued in place.
+    new_invitation = insert(ProjectInvitation).values(
+        project_id=project_id,
+        invited_email=invitation.email,
+        role=invitation.role,
+        invited_by_user_id=current_user.id,
+        invitation_token=hash_invitation_token(invitation_token)
+    )
+    db_invitation = db.scalars(
+        new_invitation.on_conflict_do_update(
+            index_elements=[ProjectInvitation.project_id, ProjectInvitation.invited_email],
+            index_where=ProjectInvitation.accepted_at.is_(None),
+            set_=dict(
+                role=new_invitation.excluded.role,
+                invited_by_user_id=new_invitation.excluded.invited_by_user_id,
+                invitation_token=new_invitation.excluded.invitation_token,
+                expires_at=text("now() + interval '7 days'"),
+                created_at=func.now()
+            ),
+            where=ProjectInvitation.is_expired
+        ).returning(ProjectInvitation)
     ).first()
     
-    if existing_invitation:
+    if db_invitation is None:
+        db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Pending invitation already exists for this email"
         )
     
-    # Create invitation
-    invitation_token = secrets.token_urlsafe(32)
-    expires_at = datetime.utcnow() + timedelta(days=7)
-    
-    db_invitation = ProjectInvitation(
-        project_id=project_id,
-        email=invitation.email,
-        role=invitation.role,
-        invited_by=current_user.id,
-        token=invitation_token,
-        expires_at=expires_at,
-        status="pending"
-    )
-    
-    db.add(db_invitation)
-    db.commit()
-    db.refresh(db_invitation)
-    
-    return InvitationResponse(
+    # Build the response from the RETURNING row before commit expires it
+    response = InvitationResponse(
         id=db_invitation.id,
         project_id=db_invitation.project_id,
-        project_name=project.name,
-        email=db_invitation.email,
+        project_name=project_name,
+        email=db_invitation.invited_email,
         role=db_invitation.role,
-        status=db_invitation.status,
-        token=db_invitation.token,
+        status="pending",
+        token=invitation_token,
         invited_by=current_user.id,
         inviter_name=current_user.email,
         expires_at=db_invitation.expires_at,
         created_at=db_invitation.created_at
     )
+    
+    db.commit()
+    
+    # Return the connection to the pool before the response is serialized
+    db.close()
+    
+    return response
 
 
 @router.get("/invitations/by-token/{token}", response_model=InvitationResponse)
@@ -195,8 +266,12 @@ def get_invitation_by_token(
     db: Session = Depends(get_db)
 ) -> Any:
     """Get invitation details by token (no auth required)."""
-    invitation = db.query(ProjectInvitation).filter(
-        ProjectInvitation.token == token
+    # Project and inviter are many-to-one, so both are JOINed into the same query
+    invitation = db.query(ProjectInvitation).options(
+        joinedload(ProjectInvitation.project),
+        joinedload(ProjectInvitation.inviter)
+    ).filter(
+        ProjectInvitation.invitation_token == hash_invitation_token(token)
     ).first()
     
     if not invitation:
@@ -205,33 +280,30 @@ def get_invitation_by_token(
             detail="Invitation not found"
         )
     
-    if invitation.status != "pending":
+    if invitation.is_accepted:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invitation has already been {invitation.status}"
+            detail="Invitation has already been accepted"
         )
     
-    if invitation.expires_at < datetime.utcnow():
-        invitation.status = "expired"
-        db.commit()
+    if invitation.is_expired:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invitation has expired"
         )
     
-    # Get project and inviter details
-    project = db.query(Project).filter(Project.id == invitation.project_id).first()
-    inviter = db.query(Profile).filter(Profile.id == invitation.invited_by).first()
+    project = invitation.project
+    inviter = invitation.inviter
     
     return InvitationResponse(
         id=invitation.id,
         project_id=invitation.project_id,
         project_name=project.name if project else "Unknown Project",
-        email=invitation.email,
+        email=invitation.invited_email,
         role=invitation.role,
-        status=invitation.status,
-        token=invitation.token,
-        invited_by=invitation.invited_by,
+        status="pending",
+        token=token,
+        invited_by=invitation.invited_by_user_id,
         inviter_name=inviter.full_name if inviter else "Unknown",
         expires_at=invitation.expires_at,
         created_at=invitation.created_at
@@ -244,68 +316,92 @@ def accept_invitation(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ) -> Any:
-    """Accept a project invitation."""
-    invitation = db.query(ProjectInvitation).filter(
-        ProjectInvitation.id == invitation_id
-    ).first()
+    """
+    Accept a project invitation.
+    The invitation update and membership insert run as a single statement;
+    the individual checks only run to explain why nothing was accepted.
+    """
+    # Commit/rollback expire current_user, so keep plain copies of what is needed later
+    user_id = current_user.id
+    user_email = current_user.email
+    
+    # Mark the invitation accepted and add the membership in one round-trip
+    accepted = update(ProjectInvitation).where(
+        ProjectInvitation.id == invitation_id,
+        ProjectInvitation.invited_email == user_email,
+        ProjectInvitation.is_pending
+    ).values(
+        accepted_at=func.now(),
+        accepted_by_user_id=user_id
+    ).returning(
+        ProjectInvitation.project_id,
+        ProjectInvitation.role
+    ).cte("accepted")
+    
+    project_id = db.scalar(
+        insert(ProjectMember).from_select(
+            ["id", "project_id", "user_id", "role"],
+            select(
+                literal(uuid7(), ProjectMember.id.type),
+                accepted.c.project_id,
+                literal(user_id, ProjectMember.user_id.type),
+                accepted.c.role
+            )
+        ).on_conflict_do_nothing(
+            index_elements=[ProjectMember.project_id, ProjectMember.user_id]
+        ).returning(ProjectMember.project_id)
+    )
     
-    if not invitation:
+    if project_id is not None:
+        db.commit()
+        invalidate_user_projects(user_id)
+        invalidate_membership(user_id, project_id)
+        
+        return {"message": "Invitation accepted successfully"}
+    
+    # Nothing was accepted; undo the invitation update (if any) and find out why
+    db.rollback()
+    row = load_invitation_for_user(db, invitation_id, user_id)
+    
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Invitation not found"
         )
     
+    invitation, membership_id = row
+    
     # Check if user's email matches invitation
-    user_profile = db.query(Profile).filter(Profile.id == current_user.id).first()
-    if user_profile.email != invitation.email:
+    if user_email != invitation.invited_email:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="This invitation is for a different email address"
         )
     
-    if invitation.status != "pending":
+    if invitation.is_accepted:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invitation has already been {invitation.status}"
+            detail="Invitation has already been accepted"
         )
     
-    if invitation.expires_at < datetime.utcnow():
-        invitation.status = "expired"
-        db.commit()
+    if invitation.is_expired:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invitation has expired"
         )
     
     # Check if already a member
-    existing_member = db.query(ProjectMember).filter(
-        and_(
-            ProjectMember.project_id == invitation.project_id,
-            ProjectMember.user_id == current_user.id
-        )
-    ).first()
-    
-    if existing_member:
+    if membership_id is not None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="You are already a member of this project"
         )
     
-    # Add user as project member
-    new_member = ProjectMember(
-        project_id=invitation.project_id,
-        user_id=current_user.id,
-        role=invitation.role
+    # The invitation changed between the two statements (e.g. concurrent accept)
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Invitation could not be accepted, please try again"
     )
-    db.add(new_member)
-    
-    # Update invitation status
-    invitation.status = "accepted"
-    invitation.responded_at = datetime.utcnow()
-    
-    db.commit()
-    
-    return {"message": "Invitation accepted successfully"}
 
 
 @router.post("/invitations/{invitation_id}/decline")
@@ -326,24 +422,24 @@ def decline_invitation(
         )
     
     # Check if user's email matches invitation
-    user_profile = db.query(Profile).filter(Profile.id == current_user.id).first()
-    if user_profile.email != invitation.email:
+    if current_user.email != invitation.invited_email:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="This invitation is for a different email address"
         )
     
-    if invitation.status != "pending":
+    if invitation.is_accepted:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invitation has already been {invitation.status}"
+            detail="Invitation has already been accepted"
         )
     
-    # Update invitation status
-    invitation.status = "declined"
-    invitation.responded_at = datetime.utcnow()
+    # Remove the declined invitation so it no longer holds the pending slot
+    # (uq_project_email_pending) and the email can be invited again
+    db.delete(invitation)
     
     db.commit()
+    db.close()
     
     return {"message": "Invitation declined"}
 
@@ -382,6 +478,8 @@ def remove_member(
     
     db.delete(membership)
     db.commit()
+    invalidate_user_projects(user_id)
+    invalidate_membership(user_id, project_id)
     
     return {"message": "Member removed successfully"}
 
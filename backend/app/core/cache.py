@@ -0,0 +1,161 @@
+"""
+In-process caching utilities.
+Short-lived caches for hot read paths such as analytics.
+"""
+
+import threading
+import time
+from functools import wraps
+from typing import Any, Callable, Hashable, Optional
+from uuid import UUID
+
+
+class TTLCache:
+    """
+    Thread-safe in-memory cache with per-entry expiry.
+
+    Expired entries are dropped lazily on access. When the cache is full,
+    the oldest entry is evicted to make room.
+
+    Attributes:
+        maxsize: Maximum number of entries kept
+        ttl: Default time-to-live in seconds
+        hits: Number of successful lookups
+        misses: Number of lookups that found nothing (or an expired entry)
+    """
+    
+    def __init__(self, maxsize: int = 10_000, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: dict[Hashable, tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing/expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+            
+            self.hits += 1
+            return value
+    
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store value under key for ttl seconds (default: cache ttl)."""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if key not in self._data and len(self._data) >= self.maxsize:
+                # Dicts keep insertion order, so the first key is the oldest
+                self._data.pop(next(iter(self._data)))
+            self._data[key] = (expires_at, value)
+    
+    def delete(self, key: Hashable) -> None:
+        """Remove key from the cache if present."""
+        with self._lock:
+            self._data.pop(key, None)
+    
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+
+
+# Verified JWT payloads, keyed by the raw token string
+token_cache = TTLCache(maxsize=10_000, ttl=30)
+
+# Project membership roles, keyed by (user id, project id) as canonical UUID strings
+membership_cache = TTLCache(maxsize=10_000, ttl=60)
+
+# Accessible project IDs, keyed by user id
+project_ids_cache = TTLCache(maxsize=10_000, ttl=10)
+
+# Analytics responses, keyed by (endpoint name, user id)
+analytics_cache = TTLCache(maxsize=10_000, ttl=60)
+_analytics_endpoints: set[str] = set()
+
+
+def cached_analytics(func: Callable) -> Callable:
+    """
+    Cache an analytics endpoint's response per user.
+
+    The wrapped endpoint must receive the authenticated user as the
+    `current_user` keyword argument (as FastAPI does for dependencies).
+    Cached entries expire after `analytics_cache.ttl` seconds or when
+    `invalidate_user_analytics` is called for the user.
+
+    Example:
+        @router.get("/kpis", response_model=KPIResponse)
+        @cached_analytics
+        def get_kpis(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+            ...
+    """
+    endpoint = func.__name__
+    _analytics_endpoints.add(endpoint)
+    
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        key = (endpoint, kwargs["current_user"].id)
+        
+        result = analytics_cache.get(key)
+        if result is None:
+            result = func(*args, **kwargs)
+            analytics_cache.set(key, result)
+        
+        return result
+    
+    return wrapper
+
+
+def invalidate_user_analytics(user_id: UUID) -> None:
+    """Drop all cached analytics responses for a user."""
+    for endpoint in _analytics_endpoints:
+        analytics_cache.delete((endpoint, user_id))
+
+
+def _membership_key(user_id: Any, project_id: Any) -> tuple[str, str]:
+    """
+    Build a membership cache key in canonical UUID form.
+
+    Path parameters arrive as raw strings, so the same project can be
+    spelled in upper or lower case; normalizing keeps every spelling on one
+    entry and lets `invalidate_membership` clear it.
+    """
+    return _canonical_id(user_id), _canonical_id(project_id)
+
+
+def _canonical_id(value: Any) -> str:
+    """Return `value` as a lower-case hyphenated UUID string if it is one."""
+    try:
+        return str(value if isinstance(value, UUID) else UUID(str(value)))
+    except ValueError:
+        return str(value)
+
+
+def get_cached_role(user_id: Any, project_id: Any) -> Optional[Any]:
+    """Return the cached role of a user in a project, or None if not cached."""
+    return membership_cache.get(_membership_key(user_id, project_id))
+
+
+def cache_role(user_id: Any, project_id: Any, role: Any) -> None:
+    """Remember a user's role in a project."""
+    membership_cache.set(_membership_key(user_id, project_id), role)
+
+
+def invalidate_membership(user_id: Any, project_id: Any) -> None:
+    """Drop the cached role of a user in a project."""
+    membership_cache.delete(_membership_key(user_id, project_id))
+
+
+def invalidate_user_projects(user_id: UUID) -> None:
+    """Drop the cached accessible project IDs and analytics for a user."""
+    project_ids_cache.delete(user_id)
+    invalidate_user_analytics(user_id)
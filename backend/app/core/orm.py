@@ -0,0 +1,28 @@
+"""
+ORM query helpers.
+"""
+
+from typing import List
+
+from sqlalchemy.orm import raiseload
+from sqlalchemy.orm.interfaces import LoaderOption
+
+from app.config import settings
+
+
+def strict_loading() -> List[LoaderOption]:
+    """
+    Loader options that forbid lazy relationship loads in debug mode.
+    
+    Add to list queries whose rows get serialized: any relationship access
+    that would issue one extra SELECT per row then raises during development
+    instead of silently causing N+1 queries. Outside debug mode no options
+    are returned, so production requests never fail on a missed eager load.
+    
+    Returns:
+        List[LoaderOption]: Options to pass to `Query.options()`
+        
+    Example:
+        tasks = db.query(Task).options(*strict_loading()).filter(...).all()
+    """
+    return [raiseload("*")] if settings.DEBUG else []
@@ -8,18 +8,11 @@ from uuid import UUID
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 
+from app.core.cache import cache_role, get_cached_role
 from app.models.project_member import ProjectMember, ProjectRole
 from app.models.user import User
 
 
-# Role hierarchy: higher value = more permissions
-ROLE_HIERARCHY = {
-    ProjectRole.VIEWER: 1,
-    ProjectRole.EDITOR: 2,
-    ProjectRole.OWNER: 3,
-}
-
-
 def check_project_access(
     db: Session,
     user: User,
@@ -60,8 +53,16 @@ def check_project_role(
     Returns:
         ProjectRole if user is a member, None otherwise
     """
+    role = get_cached_role(user.id, project_id)
+    if role is not None:
+        return role
+    
     membership = check_project_access(db, user, project_id)
-    return membership.role if membership else None
+    if not membership:
+        return None
+    
+    cache_role(user.id, project_id, membership.role)
+    return membership.role
 
 
 def require_project_role(
@@ -103,7 +104,7 @@ def require_project_role(
         )
     
     # Check if user's role is sufficient
-    if ROLE_HIERARCHY[membership.role] < ROLE_HIERARCHY[required_role]:
+    if membership.role.rank < required_role.rank:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=f"Insufficient permissions. Required role: {required_role.value}"
@@ -143,7 +144,7 @@ def can_edit_tasks(db: Session, user: User, project_id: UUID) -> bool:
     role = check_project_role(db, user, project_id)
     if not role:
         return False
-    return ROLE_HIERARCHY[role] >= ROLE_HIERARCHY[ProjectRole.EDITOR]
+    return role.rank >= ProjectRole.EDITOR.rank
 
 
 def can_manage_team(db: Session, user: User, project_id: UUID) -> bool:
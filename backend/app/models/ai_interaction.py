@@ -2,13 +2,13 @@
 AIInteraction model - Tracking AI suggestions and user modifications.
 """
 
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, JSON
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-import uuid
 
 from app.database import Base
+from app.utils.ids import uuid7
 
 
 class AIInteraction(Base):
@@ -29,16 +29,16 @@ class AIInteraction(Base):
     __tablename__ = "ai_interactions"
     
     # Primary Key
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     
     # Foreign Keys
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)  # indexed via ix_ai_interactions_user_created
     task_id = Column(UUID(as_uuid=True), ForeignKey("tasks.id", ondelete="CASCADE"), nullable=True, index=True)
     
     # Interaction Fields
     interaction_type = Column(String(50), nullable=False)  # e.g., "task_decompose", "priority_suggest"
-    original_suggestion = Column(JSON, nullable=True)
-    user_modifications = Column(JSON, nullable=True)
+    original_suggestion = Column(JSONB, nullable=True)
+    user_modifications = Column(JSONB, nullable=True)
     accepted = Column(Boolean, default=False, nullable=False)
     
     # Timestamp
@@ -48,6 +48,11 @@ class AIInteraction(Base):
     user = relationship("User", back_populates="ai_interactions")
     task = relationship("Task", back_populates="ai_interactions")
     
+    # Indexes (newest-first history per user)
+    __table_args__ = (
+        Index('ix_ai_interactions_user_created', user_id, created_at.desc()),
+    )
+    
     def __repr__(self) -> str:
         return f"<AIInteraction(id={self.id}, type={self.interaction_type}, accepted={self.accepted})>"
 
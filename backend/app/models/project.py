@@ -6,9 +6,9 @@ from sqlalchemy import Column, String, Text, DateTime, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-import uuid
 
 from app.database import Base
+from app.utils.ids import uuid7
 
 
 class Project(Base):
@@ -27,7 +27,7 @@ class Project(Base):
     __tablename__ = "projects"
     
     # Primary Key
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     
     # Foreign Keys
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -42,9 +42,12 @@ class Project(Base):
     
     # Relationships
     owner = relationship("User", back_populates="projects")
-    tasks = relationship("Task", back_populates="project", cascade="all, delete-orphan")
-    members = relationship("ProjectMember", back_populates="project", cascade="all, delete-orphan")
-    invitations = relationship("ProjectInvitation", back_populates="project", cascade="all, delete-orphan")
+    # Collections are never read alongside a project, so they stay lazy rather than
+    # eager (selectin/joined); the ON DELETE CASCADE foreign keys remove children
+    # without the ORM loading every row first
+    tasks = relationship("Task", back_populates="project", cascade="all, delete-orphan", passive_deletes=True)
+    members = relationship("ProjectMember", back_populates="project", cascade="all, delete-orphan", passive_deletes=True)
+    invitations = relationship("ProjectInvitation", back_populates="project", cascade="all, delete-orphan", passive_deletes=True)
     
     def __repr__(self) -> str:
         return f"<Project(id={self.id}, title={self.title})>"
@@ -2,14 +2,16 @@
 ProjectInvitation model - Team invitations with token-based acceptance.
 """
 
-from sqlalchemy import Column, String, DateTime, ForeignKey, Enum, UniqueConstraint
+from datetime import datetime, timezone
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index, and_, text
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
-import uuid
-import secrets
+from sqlalchemy.sql import ColumnElement, func
 
 from app.database import Base
+from app.models.types import string_enum
+from app.utils.ids import uuid7
 from app.models.project_member import ProjectRole
 
 
@@ -23,57 +25,99 @@ class ProjectInvitation(Base):
         invited_by_user_id: Who sent the invitation
         invited_email: Email address of invitee
         role: Role to assign when accepted
-        invitation_token: Unique token for acceptance
+        invitation_token: SHA-256 hex digest of the acceptance token
         accepted_by_user_id: Who accepted (null if pending)
         accepted_at: When invitation was accepted
-        expires_at: Expiration timestamp (7 days from creation)
+        expires_at: Expiration timestamp (defaults to 7 days from creation)
         created_at: Creation timestamp
     """
     
     __tablename__ = "project_invitations"
     
     # Primary Key
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     
     # Foreign Keys
     project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
-    invited_by_user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    accepted_by_user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    invited_by_user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    accepted_by_user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)  # partial index below
     
     # Invitation Fields
     invited_email = Column(String(255), nullable=False)
-    role = Column(Enum(ProjectRole), default=ProjectRole.EDITOR, nullable=False)
-    invitation_token = Column(String(64), unique=True, nullable=False, index=True, default=lambda: secrets.token_urlsafe(32))
+    role = Column(string_enum(ProjectRole, "ck_project_invitations_role"), default=ProjectRole.EDITOR, nullable=False)
+    invitation_token = Column(String(64), nullable=False)  # SHA-256 hex digest, see hash_invitation_token; unique index below
     
     # Timestamps
     accepted_at = Column(DateTime(timezone=True), nullable=True)
-    expires_at = Column(DateTime(timezone=True), nullable=False)  # Set to now() + 7 days
+    expires_at = Column(DateTime(timezone=True), server_default=text("now() + interval '7 days'"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
     # Relationships
     project = relationship("Project", back_populates="invitations")
+    # Profiles share their id with users, so the inviter's profile is reachable directly
+    inviter = relationship(
+        "Profile",
+        primaryjoin="foreign(ProjectInvitation.invited_by_user_id) == Profile.id",
+        viewonly=True
+    )
     
-    # Constraints
+    # Constraints (only one open invitation per email; accepted ones may repeat).
+    # Accepting sets accepted_at, declining deletes the row, and inviting again
+    # reissues an expired row in place, so none of them block a new invitation.
+    # The unique index leads with project_id, so it also serves "open
+    # invitations per project" lookups; expiry is checked on the matching rows
+    # because now() is not allowed in an index predicate.
     __table_args__ = (
-        UniqueConstraint('project_id', 'invited_email', name='uq_project_email'),
+        Index(
+            'uq_project_email_pending', 'project_id', 'invited_email',
+            unique=True,
+            postgresql_where=text("accepted_at IS NULL")
+        ),
+        # Single unique index for token lookups (instead of unique=True plus index=True)
+        Index('ix_invitations_token', 'invitation_token', unique=True),
+        # Mostly NULL until accepted, so only index the rows that reference a user
+        Index(
+            'ix_project_invitations_accepted_by_user_id', 'accepted_by_user_id',
+            postgresql_where=text("accepted_by_user_id IS NOT NULL")
+        ),
     )
     
     def __repr__(self) -> str:
-        return f"<ProjectInvitation(id={self.id}, invited_email={self.invited_email}, role={self.role})>"
+        return f"<ProjectInvitation(id={self.id})>"
+    
+    def __str__(self) -> str:
+        return f"ProjectInvitation(id={self.id}, invited_email={self.invited_email}, role={self.role})"
+    
+    # Hybrid properties work on loaded rows and in queries, e.g.
+    # select(ProjectInvitation).where(ProjectInvitation.is_pending)
     
-    @property
+    @hybrid_property
     def is_expired(self) -> bool:
         """Check if invitation has expired."""
-        from datetime import datetime, timezone
         return datetime.now(timezone.utc) > self.expires_at
     
-    @property
+    @is_expired.inplace.expression
+    @classmethod
+    def _is_expired_expression(cls) -> ColumnElement[bool]:
+        return cls.expires_at < func.now()
+    
+    @hybrid_property
     def is_accepted(self) -> bool:
         """Check if invitation has been accepted."""
         return self.accepted_at is not None
     
-    @property
+    @is_accepted.inplace.expression
+    @classmethod
+    def _is_accepted_expression(cls) -> ColumnElement[bool]:
+        return cls.accepted_at.is_not(None)
+    
+    @hybrid_property
     def is_pending(self) -> bool:
         """Check if invitation is still pending."""
         return not self.is_accepted and not self.is_expired
+    
+    @is_pending.inplace.expression
+    @classmethod
+    def _is_pending_expression(cls) -> ColumnElement[bool]:
+        return and_(cls.accepted_at.is_(None), cls.expires_at > func.now())
 
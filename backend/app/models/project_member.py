@@ -3,20 +3,30 @@ ProjectMember model - Team collaboration with role-based access.
 """
 
 import enum
-from sqlalchemy import Column, DateTime, ForeignKey, Enum, UniqueConstraint
+from sqlalchemy import Column, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-import uuid
 
 from app.database import Base
+from app.models.types import string_enum
+from app.utils.ids import uuid7
 
 
 class ProjectRole(str, enum.Enum):
-    """Project member roles with different permission levels."""
-    OWNER = "Owner"
-    EDITOR = "Editor"
-    VIEWER = "Viewer"
+    """
+    Project member roles with different permission levels.
+    Each role carries an integer `rank` (higher = more permissions).
+    """
+    OWNER = ("Owner", 3)
+    EDITOR = ("Editor", 2)
+    VIEWER = ("Viewer", 1)
+    
+    def __new__(cls, value: str, rank: int) -> "ProjectRole":
+        obj = str.__new__(cls, value)
+        obj._value_ = value
+        obj.rank = rank
+        return obj
 
 
 class ProjectMember(Base):
@@ -34,14 +44,14 @@ class ProjectMember(Base):
     __tablename__ = "project_members"
     
     # Primary Key
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     
     # Foreign Keys
-    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)  # indexed via ix_pm_project_user
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)  # indexed via ix_project_members_user_project
     
     # Member Fields
-    role = Column(Enum(ProjectRole), default=ProjectRole.EDITOR, nullable=False)
+    role = Column(string_enum(ProjectRole, "ck_project_members_role"), default=ProjectRole.EDITOR, nullable=False)
     
     # Timestamps
     joined_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -50,11 +60,15 @@ class ProjectMember(Base):
     project = relationship("Project", back_populates="members")
     user = relationship("User", back_populates="project_memberships")
     
-    # Constraints
+    # Constraints (the unique index INCLUDEs role so permission checks are index-only)
     __table_args__ = (
-        UniqueConstraint('project_id', 'user_id', name='uq_project_user'),
+        Index('ix_pm_project_user', 'project_id', 'user_id', unique=True, postgresql_include=['role']),
+        Index('ix_project_members_user_project', 'user_id', 'project_id'),
     )
     
     def __repr__(self) -> str:
-        return f"<ProjectMember(project_id={self.project_id}, user_id={self.user_id}, role={self.role})>"
+        return f"<ProjectMember(id={self.id})>"
+    
+    def __str__(self) -> str:
+        return f"ProjectMember(project_id={self.project_id}, user_id={self.user_id}, role={self.role})"
 
@@ -4,13 +4,14 @@ Task model - Individual tasks within projects.
 """
 
 import enum
-from sqlalchemy import Column, String, Text, Integer, Boolean, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, String, Text, Integer, Boolean, DateTime, ForeignKey, Index, CheckConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-import uuid
 
 from app.database import Base
+from app.models.types import string_enum
+from app.utils.ids import uuid7
 
 
 class TaskPriority(str, enum.Enum):
@@ -57,23 +58,23 @@ class Task(Base):
     __tablename__ = "tasks"
     
     # Primary Key
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     
     # Foreign Keys
-    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
+    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)  # indexed via composites below
     
     # Task Fields
     title = Column(String(200), nullable=False)
     description = Column(Text, nullable=True)
-    priority = Column(Enum(TaskPriority), default=TaskPriority.MEDIUM, nullable=False)
-    status = Column(Enum(TaskStatus), default=TaskStatus.TODO, nullable=False, index=True)
+    priority = Column(string_enum(TaskPriority, "ck_tasks_priority"), default=TaskPriority.MEDIUM, nullable=False)
+    status = Column(string_enum(TaskStatus, "ck_tasks_status"), default=TaskStatus.TODO, nullable=False)  # indexed via ix_tasks_project_status_created
     effort_estimate = Column(Integer, nullable=True)  # in hours
     
     # AI Tracking Fields
     ai_generated = Column(Boolean, default=False, nullable=False)
-    ai_priority_suggestion = Column(Enum(TaskPriority), nullable=True)
+    ai_priority_suggestion = Column(string_enum(TaskPriority, "ck_tasks_ai_priority_suggestion"), nullable=True)
     ai_effort_suggestion = Column(Integer, nullable=True)
-    created_by = Column(Enum(CreatedByType), default=CreatedByType.USER, nullable=False)
+    created_by = Column(string_enum(CreatedByType, "ck_tasks_created_by"), default=CreatedByType.USER, nullable=False)
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -82,10 +83,25 @@ class Task(Base):
     
     # Relationships
     project = relationship("Project", back_populates="tasks")
-    ai_interactions = relationship("AIInteraction", back_populates="task", cascade="all, delete-orphan")
+    ai_interactions = relationship("AIInteraction", back_populates="task", cascade="all, delete-orphan", passive_deletes=True)
+    
+    # Indexes for per-project boards and analytics (INCLUDE id allows index-only counts)
+    __table_args__ = (
+        Index('ix_tasks_project_status_created', 'project_id', 'status', 'created_at', postgresql_include=['id']),
+        Index('ix_tasks_project_priority', 'project_id', 'priority', postgresql_include=['id']),
+        Index('ix_tasks_project_created', 'project_id', 'created_at', postgresql_include=['id']),
+        # Mirror the TaskCreate/TaskUpdate validation for writers that bypass the schemas
+        CheckConstraint('effort_estimate IS NULL OR effort_estimate >= 0', name='ck_tasks_effort_nonneg'),
+        CheckConstraint('ai_effort_suggestion IS NULL OR ai_effort_suggestion >= 0', name='ck_tasks_ai_effort_nonneg'),
+        CheckConstraint('length(title) >= 1', name='ck_tasks_title_not_empty'),
+    )
     
     def __repr__(self) -> str:
-        return f"<Task(id={self.id}, title={self.title}, status={self.status})>"
+        # Only the primary key: cheap to build and never touches unloaded attributes
+        return f"<Task(id={self.id})>"
+    
+    def __str__(self) -> str:
+        return f"Task(id={self.id}, title={self.title}, status={self.status})"
     
     @property
     def was_modified(self) -> bool:
@@ -0,0 +1,38 @@
+"""
+Shared column types for the ORM models.
+"""
+
+import enum
+from typing import Type
+
+from sqlalchemy import Enum
+
+
+def string_enum(enum_class: Type[enum.Enum], name: str) -> Enum:
+    """
+    Store a Python enum as VARCHAR guarded by a CHECK constraint.
+    
+    Unlike a native PostgreSQL ENUM type, adding or renaming a value is a
+    plain constraint change instead of ALTER TYPE. Values (not member names)
+    are stored, e.g. 'in_progress' rather than 'IN_PROGRESS'. Databases
+    created with native enum columns need the conversion in the README
+    ("Upgrading Existing Databases") before rows load again.
+    
+    Args:
+        enum_class: Python enum providing the allowed values
+        name: Name of the generated CHECK constraint
+        
+    Returns:
+        Enum: Column type to pass to `Column()`
+        
+    Example:
+        status = Column(string_enum(TaskStatus, "ck_tasks_status"), nullable=False)
+    """
+    return Enum(
+        enum_class,
+        name=name,
+        native_enum=False,
+        create_constraint=True,
+        length=16,
+        values_callable=lambda members: [member.value for member in members]
+    )
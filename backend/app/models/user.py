@@ -2,13 +2,13 @@
 User model - Authentication and user management.
 """
 
-from sqlalchemy import Column, String, Boolean, DateTime
+from sqlalchemy import Column, String, Boolean, DateTime, CheckConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-import uuid
 
 from app.database import Base
+from app.utils.ids import uuid7
 
 
 class User(Base):
@@ -28,11 +28,11 @@ class User(Base):
     __tablename__ = "users"
     
     # Primary Key
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     
     # Authentication Fields
     email = Column(String(255), unique=True, nullable=False, index=True)
-    hashed_password = Column(String(255), nullable=False)
+    hashed_password = Column(String(60), nullable=False)  # bcrypt, see pwd_context
     
     # Status Fields
     is_active = Column(Boolean, default=True, nullable=False)
@@ -48,6 +48,14 @@ class User(Base):
     project_memberships = relationship("ProjectMember", back_populates="user", cascade="all, delete-orphan")
     ai_interactions = relationship("AIInteraction", back_populates="user", cascade="all, delete-orphan")
     
+    # bcrypt hashes are always 60 characters; relax this if pwd_context gains another scheme
+    __table_args__ = (
+        CheckConstraint('length(hashed_password) = 60', name='ck_users_hashed_password_bcrypt'),
+    )
+    
     def __repr__(self) -> str:
-        return f"<User(id={self.id}, email={self.email})>"
+        return f"<User(id={self.id})>"
+    
+    def __str__(self) -> str:
+        return f"User(id={self.id}, email={self.email})"
 
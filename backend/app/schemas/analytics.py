@@ -41,3 +41,8 @@ class StatusDistributionResponse(BaseModel):
     status: str
     count: int
 
+class AnalyticsOverviewResponse(BaseModel):
+    kpis: KPIResponse
+    task_trends: List[TaskTrendResponse]
+    priority_distribution: List[PriorityDistributionResponse]
+    status_distribution: List[StatusDistributionResponse]
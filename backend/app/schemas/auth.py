@@ -5,6 +5,8 @@ Authentication schemas for login, register, and token responses.
 from pydantic import BaseModel, EmailStr, Field
 from typing import Optional
 
+from app.schemas.types import EmailStrFast
+
 
 class UserRegister(BaseModel):
     """Schema for user registration."""
@@ -15,7 +17,7 @@ class UserRegister(BaseModel):
 
 class UserLogin(BaseModel):
     """Schema for user login."""
-    email: EmailStr
+    email: EmailStrFast
     password: str
 
 
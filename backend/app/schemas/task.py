@@ -1,11 +1,14 @@
 """Task schemas."""
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 from uuid import UUID
 from typing import Optional, List
 from app.models.task import TaskPriority, TaskStatus, CreatedByType
 
 class TaskCreate(BaseModel):
+    # Keep enum fields as plain strings; the ORM binds them without re-wrapping
+    model_config = ConfigDict(use_enum_values=True, validate_default=True)
+    
     title: str = Field(..., min_length=1, max_length=200)
     description: Optional[str] = None
     priority: TaskPriority = TaskPriority.MEDIUM
@@ -18,6 +21,8 @@ class TaskBulkCreate(BaseModel):
     tasks: List[TaskCreate]
 
 class TaskUpdate(BaseModel):
+    model_config = ConfigDict(use_enum_values=True)
+    
     title: Optional[str] = Field(None, min_length=1, max_length=200)
     description: Optional[str] = None
     priority: Optional[TaskPriority] = None
@@ -39,8 +44,7 @@ class TaskResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 class AITaskSuggestion(BaseModel):
     title: str
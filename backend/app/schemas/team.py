@@ -1,16 +1,17 @@
 """Team management schemas."""
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict
 from datetime import datetime
 from uuid import UUID
 from typing import Optional
 from app.models.project_member import ProjectRole
+from app.schemas.types import EmailStrFast
 
 class InviteMember(BaseModel):
-    email: EmailStr
+    email: EmailStrFast
     role: ProjectRole = ProjectRole.EDITOR
 
 class InvitationCreate(BaseModel):
-    email: EmailStr
+    email: EmailStrFast
     role: str = "member"  # "member" or "admin"
 
 class MemberResponse(BaseModel):
@@ -21,8 +22,7 @@ class MemberResponse(BaseModel):
     role: ProjectRole
     joined_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 class TeamMemberResponse(BaseModel):
     id: int
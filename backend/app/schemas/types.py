@@ -0,0 +1,43 @@
+"""
+Shared field types for the request/response schemas.
+"""
+
+import re
+from typing import Annotated
+
+from pydantic import AfterValidator
+
+
+# One "@", no whitespace, and a dot in the domain part
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+# Maximum address length per RFC 5321
+_EMAIL_MAX_LENGTH = 254
+
+
+def _validate_email(value: str) -> str:
+    """
+    Check an email address with a single precompiled pattern.
+    
+    The domain is lowercased the same way `EmailStr` normalizes it, so
+    addresses compare equal to the ones stored at signup.
+    
+    Args:
+        value: Email address to check
+        
+    Returns:
+        str: The email address with a lowercased domain
+        
+    Raises:
+        ValueError: If the address is too long or malformed
+    """
+    if len(value) > _EMAIL_MAX_LENGTH or not _EMAIL_RE.match(value):
+        raise ValueError("value is not a valid email address")
+    
+    local_part, domain = value.rsplit("@", 1)
+    return f"{local_part}@{domain.lower()}"
+
+
+# Lightweight alternative to EmailStr for internal endpoints; public signup
+# keeps EmailStr for the stricter email-validator checks
+EmailStrFast = Annotated[str, AfterValidator(_validate_email)]
@@ -1,10 +1,11 @@
 """User-related schemas."""
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict
 from datetime import datetime
 from uuid import UUID
+from app.schemas.types import EmailStrFast
 
 class UserBase(BaseModel):
-    email: EmailStr
+    email: EmailStrFast
     username: str | None = None
 
 class UserResponse(UserBase):
@@ -12,8 +13,7 @@ class UserResponse(UserBase):
     is_active: bool
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 class UserUpdate(BaseModel):
     username: str | None = None
@@ -0,0 +1,9 @@
+"""
+Business logic services.
+"""
+
+from app.services.team import TeamService
+
+__all__ = [
+    "TeamService",
+]
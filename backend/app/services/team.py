@@ -0,0 +1,48 @@
+"""
+Team service - Membership and invitation logic shared outside single endpoints.
+"""
+
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from app.models.project_invitation import ProjectInvitation
+
+
+class TeamService:
+    """
+    Team-related database operations.
+    
+    Attributes:
+        db: Database session used for all operations
+    
+    Example:
+        expired = TeamService(db).expire_stale_invitations()
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def expire_stale_invitations(self) -> int:
+        """
+        Delete pending invitations past their expiry time.
+        
+        Invitations have no stored status: pending means `accepted_at` is
+        NULL and `expires_at` is still ahead. Until this cleanup runs the
+        endpoints report an expired invitation as such, and inviting the
+        same email again reissues the row in place.
+        
+        Intended to run periodically (e.g. once a minute) from a scheduler,
+        so request handlers never have to write on a read path.
+        
+        Returns:
+            int: Number of invitations that were removed
+        """
+        result = self.db.execute(
+            delete(ProjectInvitation).where(
+                ProjectInvitation.accepted_at.is_(None),
+                ProjectInvitation.is_expired
+            )
+        )
+        self.db.commit()
+        
+        return result.rowcount
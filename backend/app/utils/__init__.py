@@ -0,0 +1,12 @@
+"""
+Shared helper utilities.
+"""
+
+from app.utils.ids import uuid7
+from app.utils.tokens import TokenPool, generate_invitation_token
+
+__all__ = [
+    "uuid7",
+    "TokenPool",
+    "generate_invitation_token",
+]
@@ -0,0 +1,31 @@
+"""
+Identifier generation utilities.
+"""
+
+import os
+import time
+import uuid
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Generate a time-ordered UUID (version 7, RFC 9562).
+    
+    The first 48 bits are the Unix timestamp in milliseconds and the rest is
+    random, so new keys land at the right edge of the primary-key B-tree
+    instead of on random pages like uuid4.
+    
+    Returns:
+        uuid.UUID: New version 7 UUID
+        
+    Example:
+        id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    value = (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80 | int.from_bytes(os.urandom(10), "big")
+    
+    # Set version (7) and variant (0b10) bits
+    value = (value & ~(0xF << 76)) | (0x7 << 76)
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)
+    
+    return uuid.UUID(int=value)
@@ -0,0 +1,59 @@
+"""
+Random token generation utilities.
+"""
+
+import base64
+import os
+import threading
+
+
+class TokenPool:
+    """
+    URL-safe random tokens cut from a prefilled buffer of OS randomness.
+    
+    `secrets.token_urlsafe()` reads from the OS once per token; the pool
+    reads `nbytes * batch_size` bytes at a time and slices tokens off it,
+    so bulk invitations cost one read per batch instead of one per token.
+    Every slice is handed out once, so tokens stay as unpredictable as
+    `secrets.token_urlsafe(nbytes)`.
+    
+    Example:
+        _pool = TokenPool()
+        token = _pool.next()
+    """
+    
+    def __init__(self, nbytes: int = 32, batch_size: int = 1024):
+        """
+        Args:
+            nbytes: Random bytes per token (32 matches `token_urlsafe(32)`)
+            batch_size: Tokens generated per read from the OS
+        """
+        self._nbytes = nbytes
+        self._batch_size = batch_size
+        self._buffer = b""
+        self._offset = 0
+        self._lock = threading.Lock()
+    
+    def next(self) -> str:
+        """
+        Take the next token from the pool, refilling it when exhausted.
+        
+        Returns:
+            str: URL-safe base64 token without padding
+        """
+        with self._lock:
+            if self._offset >= len(self._buffer):
+                self._buffer = os.urandom(self._nbytes * self._batch_size)
+                self._offset = 0
+            chunk = self._buffer[self._offset:self._offset + self._nbytes]
+            self._offset += self._nbytes
+        
+        return base64.urlsafe_b64encode(chunk).rstrip(b"=").decode("ascii")
+
+
+_invitation_tokens = TokenPool()
+
+
+def generate_invitation_token() -> str:
+    """Generate a new invitation token from the shared pool."""
+    return _invitation_tokens.next()
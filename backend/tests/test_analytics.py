@@ -0,0 +1,73 @@
+"""
+Tests for the analytics queries against a real PostgreSQL database.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.api.v1.analytics import (
+    _kpis,
+    _priority_distribution,
+    _status_distribution,
+    _task_trends,
+    get_user_projects
+)
+from app.models.task import Task, TaskPriority, TaskStatus
+
+
+@pytest.fixture
+def tasks(db, project):
+    now = datetime.now(timezone.utc)
+    db.add_all([
+        Task(project_id=project.id, title="Plan", priority=TaskPriority.HIGH, status=TaskStatus.TODO),
+        Task(project_id=project.id, title="Build", priority=TaskPriority.MEDIUM, status=TaskStatus.IN_PROGRESS),
+        # Done two days after creation
+        Task(
+            project_id=project.id, title="Ship", priority=TaskPriority.HIGH, status=TaskStatus.DONE,
+            created_at=now - timedelta(days=3), updated_at=now - timedelta(days=1)
+        ),
+    ])
+    db.commit()
+
+
+def test_get_user_projects_includes_owned_projects(db, project):
+    assert get_user_projects(db, project.user_id) == [project.id]
+
+
+def test_kpis(db, project, tasks):
+    kpis = _kpis(db, [project.id])
+
+    assert kpis.total_projects == 1
+    assert kpis.total_tasks == 3
+    assert kpis.completed_tasks == 1
+    assert kpis.in_progress_tasks == 1
+    assert kpis.completion_rate == 33.3
+    assert kpis.avg_completion_time == 2.0
+
+
+def test_kpis_without_projects(db):
+    kpis = _kpis(db, [])
+
+    assert kpis.total_tasks == 0
+    assert kpis.avg_completion_time is None
+
+
+def test_task_trends(db, project, tasks):
+    trends = _task_trends(db, [project.id])
+
+    assert len(trends) == 30
+    assert sum(day.created for day in trends) == 3
+    assert sum(day.completed for day in trends) == 1
+
+
+def test_priority_distribution(db, project, tasks):
+    counts = {row.priority: row.count for row in _priority_distribution(db, project.user_id)}
+
+    assert counts == {"low": 0, "medium": 1, "high": 2}
+
+
+def test_status_distribution(db, project, tasks):
+    counts = {row.status: row.count for row in _status_distribution(db, project.user_id)}
+
+    assert counts == {"todo": 1, "in_progress": 1, "done": 1}
@@ -0,0 +1,31 @@
+"""
+Tests for the project endpoints against a real PostgreSQL database.
+"""
+
+from app.api.v1.analytics import get_kpis
+from app.api.v1.projects import delete_project
+from app.core.cache import analytics_cache, cache_role, get_cached_role, project_ids_cache
+from app.models.project_member import ProjectMember, ProjectRole
+from app.models.user import User
+
+
+def test_delete_project_invalidates_every_member(db, project):
+    owner = project.owner
+    editor = User(email="editor@example.com", hashed_password="x" * 60)
+    db.add(editor)
+    db.flush()
+    db.add(ProjectMember(project_id=project.id, user_id=editor.id, role=ProjectRole.EDITOR))
+    db.commit()
+    
+    user_ids = [owner.id, editor.id]
+    for user_id in user_ids:
+        cache_role(user_id, project.id, "Editor")
+        project_ids_cache.set(user_id, [project.id])
+        analytics_cache.set((get_kpis.__name__, user_id), object())
+    
+    delete_project(str(project.id), db=db, current_user=owner)
+    
+    for user_id in user_ids:
+        assert get_cached_role(user_id, project.id) is None
+        assert project_ids_cache.get(user_id) is None
+        assert analytics_cache.get((get_kpis.__name__, user_id)) is None
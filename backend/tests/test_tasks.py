@@ -0,0 +1,18 @@
+"""
+Tests for the task endpoints against a real PostgreSQL database.
+"""
+
+from app.api.v1.tasks import create_tasks_bulk
+from app.models.task import Task
+from app.schemas.task import TaskBulkCreate, TaskCreate
+
+
+def test_create_tasks_bulk_returns_tasks_in_request_order(db, project):
+    titles = [f"Step {i}" for i in range(20)]
+    owner = project.owner
+    bulk_data = TaskBulkCreate(tasks=[TaskCreate(title=title) for title in titles])
+    
+    response = create_tasks_bulk(str(project.id), bulk_data, db=db, current_user=owner)
+    
+    assert [task.title for task in response] == titles
+    assert db.query(Task).filter(Task.project_id == project.id).count() == len(titles)
@@ -0,0 +1,53 @@
+"""
+Tests for TeamService against a real PostgreSQL database.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+
+from app.models.project_invitation import ProjectInvitation
+from app.services.team import TeamService
+
+
+def _invitation(project, email, token, expires_at, accepted_at=None):
+    return ProjectInvitation(
+        project_id=project.id,
+        invited_by_user_id=project.user_id,
+        invited_email=email,
+        invitation_token=token,
+        expires_at=expires_at,
+        accepted_at=accepted_at,
+        accepted_by_user_id=project.user_id if accepted_at else None
+    )
+
+
+def test_expire_stale_invitations_removes_only_expired_pending(db, project):
+    now = datetime.now(timezone.utc)
+    db.add_all([
+        _invitation(project, "expired@example.com", "a" * 64, now - timedelta(days=1)),
+        _invitation(project, "pending@example.com", "b" * 64, now + timedelta(days=1)),
+        _invitation(
+            project, "accepted@example.com", "c" * 64, now - timedelta(days=1),
+            accepted_at=now - timedelta(days=2)
+        ),
+    ])
+    db.commit()
+    
+    removed = TeamService(db).expire_stale_invitations()
+    
+    assert removed == 1
+    remaining = db.scalars(
+        select(ProjectInvitation.invited_email).order_by(ProjectInvitation.invited_email)
+    ).all()
+    assert remaining == ["accepted@example.com", "pending@example.com"]
+
+
+def test_expire_stale_invitations_without_stale_rows(db, project):
+    db.add(_invitation(
+        project, "pending@example.com", "a" * 64,
+        datetime.now(timezone.utc) + timedelta(days=7)
+    ))
+    db.commit()
+    
+    assert TeamService(db).expire_stale_invitations() == 0